@@ -195,6 +195,9 @@ class FacebookDownloader:
         
         Args:
             url: Facebook post URL
+            
+        Returns:
+            bool: True if the download succeeded
         """
         output_template = os.path.join(self.download_path, '%(title)s_%(id)s.%(ext)s')
         
@@ -214,9 +217,11 @@ class FacebookDownloader:
                     print(f"\n✓ Downloaded {len(info.get('entries', []))} item(s) from album!")
                 else:
                     print("\n✓ Post downloaded successfully!")
+            return True
         except Exception as e:
             print(f"\n✗ Error downloading post: {str(e)}")
             self._show_facebook_help()
+            return False
     
     def download_video(self, url, quality='best'):
         """
@@ -250,6 +255,9 @@ class FacebookDownloader:
         
         Args:
             url: Facebook URL
+            
+        Returns:
+            bool: True if the download succeeded
         """
         output_template = os.path.join(self.download_path, 'audio', '%(title)s_%(id)s.%(ext)s')
         
@@ -275,8 +283,10 @@ class FacebookDownloader:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
             print("\n✓ Audio downloaded successfully!")
+            return True
         except Exception as e:
             print(f"\n✗ Error downloading audio: {str(e)}")
+            return False
     
     def batch_download(self, urls):
         """
@@ -159,6 +159,9 @@ class InstagramDownloader:
         Args:
             url: Instagram post URL
             download_thumbnail: Download thumbnail for videos
+            
+        Returns:
+            bool: True if the download succeeded
         """
         output_template = os.path.join(self.download_path, '%(uploader)s_%(id)s.%(ext)s')
         
@@ -181,11 +184,13 @@ class InstagramDownloader:
                     print(f"✓ Downloaded {len(info.get('entries', []))} media items from carousel!")
                 else:
                     print("\n✓ Post downloaded successfully!")
+            return True
         except Exception as e:
             print(f"\n✗ Error downloading post: {str(e)}")
             print("\n⚠ If this is a private post or carousel:")
             print("  Go to Advanced Options → Enable Browser Cookies")
             print("📌 Make sure you're logged into Instagram in that browser.")
+            return False
     
     def download_reel(self, url, quality='best'):
         """
@@ -283,6 +288,9 @@ class InstagramDownloader:
         
         Args:
             url: Instagram URL
+            
+        Returns:
+            bool: True if the download succeeded
         """
         output_template = os.path.join(self.download_path, 'audio', '%(uploader)s_%(id)s.%(ext)s')
         
@@ -308,8 +316,10 @@ class InstagramDownloader:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
             print("\n✓ Audio downloaded successfully!")
+            return True
         except Exception as e:
             print(f"\n✗ Error downloading audio: {str(e)}")
+            return False
     
     def batch_download(self, urls):
         """
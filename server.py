@@ -5,18 +5,30 @@ Provides REST API endpoints for downloading media from various platforms
 
 
 from flask import Flask, request, jsonify, send_file
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
 from flasgger import Swagger, swag_from
 import logging
 import os
 import re
+import threading
+from urllib.parse import urlsplit
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+from cachetools import LRUCache, TTLCache
+import orjson
 import yt_dlp
+from yt_dlp.utils import DownloadError
 from youtube import YouTubeDownloader
 from instagram import InstagramDownloader
 from facebook import FacebookDownloader
 
 # Celery setup (optional - for future async tasks)
 from celery import Celery
+from kombu import Exchange, Queue
 
 def make_celery(app):
     celery = Celery(
@@ -25,6 +37,45 @@ def make_celery(app):
         broker=os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
     )
     celery.conf.update(app.config)
+    celery.conf.update(
+        task_protocol=2,
+        # Enough pooled broker connections for every web worker to publish without waiting
+        broker_pool_limit=max(10, 2 * (os.cpu_count() or 1)),
+        broker_transport_options={
+            'visibility_timeout': 3600,
+            'socket_keepalive': True,
+            'socket_keepalive_options': {}
+        }
+    )
+    # Downloads are idempotent: ack after completion so a crashed worker's job is redelivered
+    celery.conf.update(
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+        task_reject_on_worker_lost=True,
+        task_acks_on_failure_or_timeout=False
+    )
+    # Recycle prefork children so memory retained by long yt-dlp runs is released
+    celery.conf.worker_max_tasks_per_child = 50
+    # Nothing reads task results. Errors are kept for debugging, but a success is never
+    # stored, so a job that retried and then finished still reads RETRY.
+    celery.conf.update(
+        task_ignore_result=True,
+        task_store_errors_even_if_ignored=True
+    )
+    # Keep quick thumbnail/subtitle jobs from queueing behind full downloads.
+    # Queues are transient: a lost download request is harmless, so skip the broker's disk write.
+    downloads = Exchange('downloads', type='direct', delivery_mode=1)
+    celery.conf.task_queues = (
+        Queue('short', downloads, routing_key='short', durable=False),
+        Queue('long', downloads, routing_key='long', durable=False),
+    )
+    celery.conf.task_default_queue = 'long'
+    celery.conf.task_default_exchange = 'downloads'
+    celery.conf.task_default_routing_key = 'long'
+    celery.conf.task_routes = {
+        'server.async_download_short': {'queue': 'short'},
+        'server.async_download_long': {'queue': 'long'},
+    }
     class ContextTask(celery.Task):
         def __call__(self, *args, **kwargs):
             with app.app_context():
@@ -33,8 +84,25 @@ def make_celery(app):
     return celery
 
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs):
+        # Swagger specs use integer status codes as keys
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app, resources={r"/api/*": {"origins": os.environ.get('CORS_ORIGINS', '*')}})
+# Compress JSON responses (the YouTube formats list) based on Accept-Encoding
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 500
+Compress(app)
+app.config['SWAGGER'] = {'uiversion': 3}
 Swagger(app)
 
 # Logging setup
@@ -44,6 +112,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _json():
+    """Parse the request body with orjson (an empty body parses as {})"""
+    return orjson.loads(request.get_data(cache=False) or b'{}')
+
+
 # Celery instance
 celery = make_celery(app)
 
@@ -52,23 +125,278 @@ youtube_dl = YouTubeDownloader()
 instagram_dl = InstagramDownloader()
 facebook_dl = FacebookDownloader()
 
+# Optional cookies for private Instagram/Facebook content, checked once at startup
+_COOKIES_FILE = 'cookies.txt' if os.path.exists('cookies.txt') else None
+
+# Read-only base yt-dlp options for /api/download; copy before adding a format
+_YT_BASE = MappingProxyType({
+    'quiet': True,
+    'no_warnings': True,
+    'nocheckcertificate': True,
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+})
+_IG_BASE = MappingProxyType({
+    'quiet': True,
+    'no_warnings': True,
+    'cookiefile': _COOKIES_FILE
+})
+_FB_BASE = MappingProxyType({
+    'quiet': True,
+    'no_warnings': True,
+    'cookiefile': _COOKIES_FILE
+})
+
+# Media info cache shared by /api/detect and /api/download, keyed by (platform, url)
+_INFO_CACHE = TTLCache(maxsize=1024, ttl=300)
+_info_lock = threading.Lock()
+_INFO_FETCHERS = {
+    'youtube': youtube_dl.get_video_info,
+    'instagram': instagram_dl.get_media_info,
+    'facebook': facebook_dl.get_video_info,
+}
+# Top-level info fields the routes read; everything else is dropped before caching
+_INFO_FIELDS = ('title', 'uploader', 'duration', 'thumbnail')
+
+# Idle yt-dlp instances pooled by their options; reusing one keeps its HTTP connections alive
+_YDL_POOL_SIZE = 4
+_ydl_lock = threading.Lock()
+
+
+class _YdlPools(LRUCache):
+    """Idle YoutubeDL instances per option set; evicted instances are closed"""
+
+    def popitem(self):
+        key, idle = super().popitem()
+        for ydl in idle:
+            ydl.close()
+        return key, idle
 
+
+_YDL_POOLS = _YdlPools(maxsize=64)
+
+
+# Platform detection by host name (exact host first, then its parent domain)
+_HOST_SUFFIX = {
+    'youtube.com': 'youtube',
+    'www.youtube.com': 'youtube',
+    'm.youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'instagram.com': 'instagram',
+    'www.instagram.com': 'instagram',
+    'facebook.com': 'facebook',
+    'm.facebook.com': 'facebook',
+    'fb.watch': 'facebook',
+}
+
+
+@lru_cache(maxsize=4096)
 def detect_platform(url):
     """Detect platform from URL"""
-    url = url.lower()
-    
-    if 'youtube.com' in url or 'youtu.be' in url:
-        return 'youtube'
-    elif 'instagram.com' in url:
-        return 'instagram'
-    elif 'facebook.com' in url or 'fb.watch' in url:
-        return 'facebook'
-    else:
+    # Accept bare "youtube.com/watch?v=..." links as well as full URLs
+    try:
+        host = urlsplit(url if '//' in url else '//' + url).hostname or ''
+    except ValueError:
+        # Malformed URLs (e.g. an unclosed IPv6 bracket) are simply unsupported
         return 'unknown'
+    return _HOST_SUFFIX.get(host) or _HOST_SUFFIX.get(host.split('.', 1)[-1], 'unknown')
 
 
-@app.route('/api/detect', methods=['POST'])
-@swag_from({
+def _slim_info(info):
+    """Reduce a yt-dlp info dict to the fields /api/detect and /api/download read"""
+    slim = {k: info[k] for k in _INFO_FIELDS if k in info}
+    if info.get('formats'):
+        # display_formats() only looks at height and vcodec
+        slim['formats'] = [
+            {'height': f.get('height'), 'vcodec': f.get('vcodec', 'none')}
+            for f in info['formats']
+        ]
+    if info.get('subtitles'):
+        # /api/download only serves the first track of each language
+        slim['subtitles'] = {lang: subs[:1] for lang, subs in info['subtitles'].items() if subs}
+    return slim
+
+
+def _cached_info(platform, url):
+    """Fetch media info for a URL, reusing recent results"""
+    key = (platform, url)
+    with _info_lock:
+        info = _INFO_CACHE.get(key)
+    if info is None:
+        info = _INFO_FETCHERS[platform](url)
+        if info:
+            info = _slim_info(info)
+            with _info_lock:
+                _INFO_CACHE[key] = info
+    return info
+
+
+@contextmanager
+def _borrow_ydl(opts):
+    """Lend a YoutubeDL for these options to one caller at a time"""
+    # YoutubeDL keeps per-instance counters and extractor state, so it is never shared
+    key = frozenset(opts.items())
+    with _ydl_lock:
+        idle = _YDL_POOLS.get(key)
+        ydl = idle.pop() if idle else None
+    if ydl is None:
+        # YoutubeDL fills in defaults on the dict it is given; keep the caller's intact
+        ydl = yt_dlp.YoutubeDL(dict(opts))
+    try:
+        yield ydl
+    finally:
+        with _ydl_lock:
+            idle = _YDL_POOLS.setdefault(key, [])
+            if len(idle) < _YDL_POOL_SIZE:
+                idle.append(ydl)
+                ydl = None
+        if ydl is not None:
+            ydl.close()
+
+
+# Fields /api/detect exposes from each display_formats() entry
+_FORMAT_FIELDS = itemgetter('height', 'display')
+
+
+# Options that finish in well under a second; everything else is a full download
+_SHORT_OPTIONS = ('thumbnail', 'subtitles')
+
+# Most jobs /api/download/bulk accepts in one request
+_BULK_MAX_JOBS = 20
+
+
+def _quality_height(format_id):
+    """Convert a format_id (video height) to an int, or None for best quality"""
+    return int(format_id) if format_id else None
+
+
+# (platform, option) -> handler(url, format_id); (platform, 'default') covers video/post
+_DOWNLOAD_DISPATCH = {
+    ('youtube', 'thumbnail'): lambda url, fid: youtube_dl.download_thumbnail(url),
+    ('youtube', 'subtitles'): lambda url, fid: youtube_dl.download_subtitles_only(url),
+    ('youtube', 'audio'): lambda url, fid: youtube_dl.download_audio(url),
+    ('youtube', 'default'): lambda url, fid: youtube_dl.download_video(url, quality_height=_quality_height(fid)),
+    ('instagram', 'audio'): lambda url, fid: instagram_dl.download_audio(url),
+    ('instagram', 'default'): lambda url, fid: instagram_dl.download_post(url),
+    ('facebook', 'audio'): lambda url, fid: facebook_dl.download_audio(url),
+    ('facebook', 'default'): lambda url, fid: facebook_dl.download_post(url),
+}
+
+
+def _job_error(platform, url, option, format_id=None):
+    """Return why a download job cannot run, or None if it is valid"""
+    # download_playlist() prompts on stdin, which a worker does not have
+    if option == 'playlist':
+        return 'Playlist downloads cannot be queued. Please queue videos individually.'
+    if option in _SHORT_OPTIONS and platform != 'youtube':
+        return f'{option} is only available for YouTube'
+    if (platform, option) not in _DOWNLOAD_DISPATCH and (platform, 'default') not in _DOWNLOAD_DISPATCH:
+        return f'Unknown platform: {platform}'
+    # Workers save whatever they are given, so only queue links to the named platform
+    if detect_platform(url) != platform:
+        return f'URL is not a {platform} link'
+    if platform == 'youtube':
+        try:
+            _quality_height(format_id)
+        except (TypeError, ValueError):
+            return f'Invalid format_id: {format_id}'
+    return None
+
+
+def _run_download(task, platform, url, option, format_id):
+    """Run the handler for (platform, option), retrying the task when the download fails"""
+    error = _job_error(platform, url, option, format_id)
+    if error:
+        # Permanent: raise outside the retry path so the backend records FAILURE
+        raise ValueError(error)
+    handler = _DOWNLOAD_DISPATCH.get((platform, option)) or _DOWNLOAD_DISPATCH[(platform, 'default')]
+    try:
+        # The downloaders print their own errors and report failure by returning False
+        if not handler(url, format_id):
+            raise DownloadError(f'{option} download failed for {url}')
+    except DownloadError as e:
+        # Re-fetching the same URL is safe, so retry instead of dropping the job
+        logger.warning(f"Retrying {option} download for {url}: {str(e)}")
+        raise task.retry(exc=e)
+    return {'status': 'completed'}
+
+
+@celery.task(bind=True, max_retries=3, default_retry_delay=30, acks_late=True)
+def async_download_short(self, platform, url, option, format_id=None):
+    """Fetch a thumbnail or subtitles to the server's downloads folder"""
+    return _run_download(self, platform, url, option, format_id)
+
+
+@celery.task(bind=True, max_retries=3, default_retry_delay=30, acks_late=True)
+def async_download_long(self, platform, url, option, format_id=None):
+    """Download video, audio or posts to the server's downloads folder"""
+    return _run_download(self, platform, url, option, format_id)
+
+
+def _download_signature(platform, url, option, format_id=None):
+    """Pick the short or long download task for an option"""
+    task = async_download_short if option in _SHORT_OPTIONS else async_download_long
+    return task.s(platform, url, option, format_id)
+
+
+def _youtube_detect(url, info, fields):
+    """Build the /api/detect response for a YouTube video"""
+    response = {
+        'platform': 'youtube',
+        'title': info.get('title', 'Unknown'),
+        'uploader': info.get('uploader', 'Unknown'),
+        'duration': info.get('duration', 0),
+        'thumbnail': info.get('thumbnail', ''),
+        'has_subtitles': bool(info.get('subtitles')),
+        'options': ['video', 'audio', 'playlist', 'subtitles', 'thumbnail']
+    }
+    # Building the quality list walks every format; previews skip it
+    if 'formats' in fields:
+        formats = youtube_dl.display_formats(info, return_formats=True)
+        response['formats'] = [
+            {'format_id': height, 'label': label}
+            for height, label in map(_FORMAT_FIELDS, formats)
+        ]
+    return response
+
+
+def _instagram_detect(url, info, fields):
+    """Build the /api/detect response for Instagram media"""
+    return {
+        'platform': 'instagram',
+        'title': info.get('title', 'Unknown'),
+        'uploader': info.get('uploader', 'Unknown'),
+        'thumbnail': info.get('thumbnail', ''),
+        'media_type': instagram_dl.detect_media_type(url),
+        'options': ['post', 'audio']
+    }
+
+
+def _facebook_detect(url, info, fields):
+    """Build the /api/detect response for Facebook content"""
+    return {
+        'platform': 'facebook',
+        'title': info.get('title', 'Unknown'),
+        'uploader': info.get('uploader', 'Unknown'),
+        'duration': info.get('duration', 0),
+        'thumbnail': info.get('thumbnail', ''),
+        'content_type': facebook_dl.detect_content_type(url),
+        'options': ['post', 'audio']
+    }
+
+
+# Fields returned when the client does not ask for a subset
+_DETECT_DEFAULT_FIELDS = 'title,uploader,thumbnail,formats'
+
+# platform -> (response builder, log label, noun for the client error)
+_DETECT_DISPATCH = {
+    'youtube': (_youtube_detect, 'YouTube video', 'video'),
+    'instagram': (_instagram_detect, 'Instagram media', 'media'),
+    'facebook': (_facebook_detect, 'Facebook content', 'content'),
+}
+
+
+# Swagger specs, built once at import and shared with flasgger
+_DETECT_SPEC = {
     'tags': ['Detection'],
     'parameters': [
         {
@@ -78,7 +406,12 @@ def detect_platform(url):
             'schema': {
                 'type': 'object',
                 'properties': {
-                    'url': {'type': 'string', 'example': 'https://youtube.com/watch?v=...'}
+                    'url': {'type': 'string', 'example': 'https://youtube.com/watch?v=...'},
+                    'fields': {
+                        'type': 'string',
+                        'description': 'Comma-separated fields to compute; omit "formats" for a quick preview',
+                        'example': 'title,uploader,thumbnail,formats'
+                    }
                 },
                 'required': ['url']
             }
@@ -102,17 +435,96 @@ def detect_platform(url):
         400: {'description': 'Invalid input'},
         500: {'description': 'Server error'}
     }
-})
+}
+
+_DOWNLOAD_SPEC = {
+    'tags': ['Download'],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'url': {'type': 'string'},
+                    'platform': {'type': 'string'},
+                    'option': {'type': 'string'},
+                    'format_id': {'type': 'string'}
+                },
+                'required': ['url', 'platform', 'option']
+            }
+        }
+    ],
+    'responses': {
+        200: {'description': 'Download URL returned'},
+        400: {'description': 'Invalid input'},
+        500: {'description': 'Server error'}
+    }
+}
+
+_DOWNLOAD_BULK_SPEC = {
+    'tags': ['Download'],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'jobs': {
+                        'type': 'array',
+                        'maxItems': 20,
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'url': {'type': 'string'},
+                                'platform': {'type': 'string'},
+                                'option': {'type': 'string'},
+                                'format_id': {'type': 'string'}
+                            },
+                            'required': ['url', 'platform', 'option']
+                        }
+                    }
+                },
+                'required': ['jobs']
+            }
+        }
+    ],
+    'responses': {
+        202: {'description': 'Download tasks queued'},
+        400: {'description': 'Invalid input'},
+        500: {'description': 'Server error'}
+    }
+}
+
+_HEALTH_SPEC = {
+    'tags': ['Health'],
+    'responses': {
+        200: {'description': 'API is healthy'}
+    }
+}
+
+
+@app.route('/api/detect', methods=['POST'])
+@swag_from(_DETECT_SPEC)
 def detect():
     """Detect platform and get media info"""
     try:
-        data = request.json
+        data = _json()
         url = data.get('url', '')
+        fields = data.get('fields') or _DETECT_DEFAULT_FIELDS
         
         if not url:
             logger.warning('No URL provided to /api/detect')
             return jsonify({'error': 'URL is required'}), 400
         
+        if not isinstance(fields, str):
+            logger.warning('Non-string fields provided to /api/detect')
+            return jsonify({'error': 'fields must be a comma-separated string'}), 400
+        fields = {f.strip() for f in fields.split(',')}
+        
         platform = detect_platform(url)
         
         if platform == 'unknown':
@@ -121,57 +533,12 @@ def detect():
         
         # Get media info based on platform
         try:
-            if platform == 'youtube':
-                info = youtube_dl.get_video_info(url)
-                if not info:
-                    logger.error('Failed to fetch YouTube video information')
-                    return jsonify({'error': 'Failed to fetch video information'}), 400
-                formats = youtube_dl.display_formats(info, return_formats=True)
-                formatted_formats = [
-                    {'format_id': f['height'], 'label': f['display']} for f in formats
-                ]
-                response = {
-                    'platform': 'youtube',
-                    'title': info.get('title', 'Unknown'),
-                    'uploader': info.get('uploader', 'Unknown'),
-                    'duration': info.get('duration', 0),
-                    'thumbnail': info.get('thumbnail', ''),
-                    'formats': formatted_formats,
-                    'has_subtitles': bool(info.get('subtitles')),
-                    'options': ['video', 'audio', 'playlist', 'subtitles', 'thumbnail']
-                }
-            elif platform == 'instagram':
-                info = instagram_dl.get_media_info(url)
-                if not info:
-                    logger.error('Failed to fetch Instagram media information')
-                    return jsonify({'error': 'Failed to fetch media information'}), 400
-                media_type = instagram_dl.detect_media_type(url)
-                response = {
-                    'platform': 'instagram',
-                    'title': info.get('title', 'Unknown'),
-                    'uploader': info.get('uploader', 'Unknown'),
-                    'thumbnail': info.get('thumbnail', ''),
-                    'media_type': media_type,
-                    'options': ['post', 'audio']
-                }
-            elif platform == 'facebook':
-                info = facebook_dl.get_video_info(url)
-                if not info:
-                    logger.error('Failed to fetch Facebook content information')
-                    return jsonify({'error': 'Failed to fetch content information'}), 400
-                content_type = facebook_dl.detect_content_type(url)
-                response = {
-                    'platform': 'facebook',
-                    'title': info.get('title', 'Unknown'),
-                    'uploader': info.get('uploader', 'Unknown'),
-                    'duration': info.get('duration', 0),
-                    'thumbnail': info.get('thumbnail', ''),
-                    'content_type': content_type,
-                    'options': ['post', 'audio']
-                }
-            else:
-                logger.error(f'Unknown platform: {platform}')
-                return jsonify({'error': 'Unknown platform'}), 400
+            build_response, label, noun = _DETECT_DISPATCH[platform]
+            info = _cached_info(platform, url)
+            if not info:
+                logger.error(f'Failed to fetch {label} information')
+                return jsonify({'error': f'Failed to fetch {noun} information'}), 400
+            response = build_response(url, info, fields)
             logger.info(f"/api/detect success for {platform} - {url}")
             return jsonify(response)
         except Exception as e:
@@ -179,43 +546,17 @@ def detect():
             return jsonify({'error': str(e)}), 500
         
     except Exception as e:
-        print(f"Server error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Server error in /api/detect")
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/download', methods=['POST'])
-@swag_from({
-    'tags': ['Download'],
-    'parameters': [
-        {
-            'name': 'body',
-            'in': 'body',
-            'required': True,
-            'schema': {
-                'type': 'object',
-                'properties': {
-                    'url': {'type': 'string'},
-                    'platform': {'type': 'string'},
-                    'option': {'type': 'string'},
-                    'format_id': {'type': 'string'}
-                },
-                'required': ['url', 'platform', 'option']
-            }
-        }
-    ],
-    'responses': {
-        200: {'description': 'Download URL returned'},
-        400: {'description': 'Invalid input'},
-        500: {'description': 'Server error'}
-    }
-})
+@swag_from(_DOWNLOAD_SPEC)
 def download():
     """Get download URL for media - download happens in browser"""
 
     try:
-        data = request.json
+        data = _json()
         url = data.get('url', '')
         platform = data.get('platform', '')
         option = data.get('option', '')
@@ -230,18 +571,13 @@ def download():
         filename = None
         
         if platform == 'youtube':
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'nocheckcertificate': True,
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
+            ydl_opts = _YT_BASE.copy()
             
             if option == 'audio':
                 ydl_opts['format'] = 'bestaudio/best'
             elif option == 'thumbnail':
                 # Return thumbnail URL directly
-                info = youtube_dl.get_video_info(url)
+                info = _cached_info('youtube', url)
                 if info and info.get('thumbnail'):
                     return jsonify({
                         'success': True,
@@ -250,7 +586,7 @@ def download():
                     })
             elif option == 'subtitles':
                 # Get subtitle URLs
-                info = youtube_dl.get_video_info(url)
+                info = _cached_info('youtube', url)
                 if info and info.get('subtitles'):
                     # Return first available subtitle
                     for lang, subs in info['subtitles'].items():
@@ -273,54 +609,46 @@ def download():
             
             if option not in ['thumbnail', 'subtitles', 'playlist']:
                 try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    with _borrow_ydl(ydl_opts) as ydl:
                         info = ydl.extract_info(url, download=False)
-                        # For formats with separate audio/video, get the requested formats
-                        if 'requested_formats' in info:
-                            # Use the first format (video) URL
-                            download_url = info['requested_formats'][0]['url']
-                        else:
-                            download_url = info.get('url')
-                        
-                        filename = f"{info.get('title', 'video')}.{info.get('ext', 'mp4')}"
+                    # For formats with separate audio/video, get the requested formats
+                    if 'requested_formats' in info:
+                        # Use the first format (video) URL
+                        download_url = info['requested_formats'][0]['url']
+                    else:
+                        download_url = info.get('url')
+                    
+                    filename = f"{info.get('title', 'video')}.{info.get('ext', 'mp4')}"
                 except Exception as e:
                     logger.exception(f"yt-dlp error: {str(e)}")
                     return jsonify({'error': f'Failed to get download URL: {str(e)}'}), 500
         
         elif platform == 'instagram':
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'cookiefile': 'cookies.txt' if os.path.exists('cookies.txt') else None
-            }
+            ydl_opts = _IG_BASE.copy()
             
             if option == 'audio':
                 ydl_opts['format'] = 'bestaudio/best'
             
             try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                with _borrow_ydl(ydl_opts) as ydl:
                     info = ydl.extract_info(url, download=False)
-                    download_url = info.get('url')
-                    filename = f"{info.get('title', 'instagram')}.{info.get('ext', 'mp4')}"
+                download_url = info.get('url')
+                filename = f"{info.get('title', 'instagram')}.{info.get('ext', 'mp4')}"
             except Exception as e:
                 logger.error(f"Instagram error: {str(e)}")
                 return jsonify({'error': f'Failed to get download URL: {str(e)}'}), 500
         
         elif platform == 'facebook':
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'cookiefile': 'cookies.txt' if os.path.exists('cookies.txt') else None
-            }
+            ydl_opts = _FB_BASE.copy()
             
             if option == 'audio':
                 ydl_opts['format'] = 'bestaudio/best'
             
             try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                with _borrow_ydl(ydl_opts) as ydl:
                     info = ydl.extract_info(url, download=False)
-                    download_url = info.get('url')
-                    filename = f"{info.get('title', 'facebook')}.{info.get('ext', 'mp4')}"
+                download_url = info.get('url')
+                filename = f"{info.get('title', 'facebook')}.{info.get('ext', 'mp4')}"
             except Exception as e:
                 logger.error(f"Facebook error: {str(e)}")
                 return jsonify({'error': f'Failed to get download URL: {str(e)}'}), 500
@@ -340,14 +668,55 @@ def download():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/download/bulk', methods=['POST'])
+@swag_from(_DOWNLOAD_BULK_SPEC)
+def download_bulk():
+    """Queue several server-side downloads in one request"""
+    try:
+        data = _json()
+        jobs = data.get('jobs') if isinstance(data, dict) else None
+
+        if not isinstance(jobs, list) or not jobs or not all(
+            isinstance(j, dict)
+            and isinstance(j.get('url'), str) and j['url']
+            and isinstance(j.get('platform'), str) and j['platform']
+            and isinstance(j.get('option', ''), str)
+            for j in jobs
+        ):
+            logger.warning('Missing or invalid jobs in /api/download/bulk')
+            return jsonify({'error': 'A list of jobs with url and platform is required'}), 400
+
+        if len(jobs) > _BULK_MAX_JOBS:
+            logger.warning(f'Too many jobs in /api/download/bulk: {len(jobs)}')
+            return jsonify({'error': f'At most {_BULK_MAX_JOBS} jobs can be queued per request'}), 400
+
+        # Reject the whole request up front rather than queueing jobs the workers would drop
+        for j in jobs:
+            error = _job_error(j['platform'], j['url'], j.get('option', ''), j.get('format_id'))
+            if error:
+                logger.warning(f'Invalid job in /api/download/bulk: {error}')
+                return jsonify({'error': error}), 400
+
+        # Publish every job through one producer taken from the pool rather than
+        # acquiring a broker connection per task. Not a group: a group subscribes
+        # to each task's result, and these tasks never publish one.
+        with celery.producer_pool.acquire(block=True) as producer:
+            task_ids = [
+                _download_signature(
+                    j['platform'], j['url'], j.get('option', ''), j.get('format_id')
+                ).apply_async(producer=producer).id
+                for j in jobs
+            ]
+        logger.info(f"Queued {len(jobs)} downloads via /api/download/bulk")
+        return jsonify({'task_ids': task_ids}), 202
+
+    except Exception as e:
+        logger.exception(f"Error in /api/download/bulk: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 
 @app.route('/api/health', methods=['GET'])
-@swag_from({
-    'tags': ['Health'],
-    'responses': {
-        200: {'description': 'API is healthy'}
-    }
-})
+@swag_from(_HEALTH_SPEC)
 def health():
     """Health check endpoint"""
     return jsonify({'status': 'ok', 'message': 'UniDownload API is running'})
@@ -359,9 +728,12 @@ def health():
 
 
 if __name__ == '__main__':
-    os.makedirs('static', exist_ok=True)
-    port = int(os.environ.get('PORT', 5000))
-    logger.info(f"Starting UniDownload API Server on port {port}")
-    logger.info("API docs available at /apidocs")
-    debug_mode = os.environ.get('FLASK_ENV') != 'production'
-    app.run(debug=debug_mode, host='0.0.0.0', port=port, use_reloader=False)
+    # The Werkzeug dev server handles one request at a time; production runs wsgi:app under gunicorn
+    if os.environ.get('FLASK_ENV') == 'development':
+        os.makedirs('static', exist_ok=True)
+        port = int(os.environ.get('PORT', 5000))
+        logger.info(f"Starting UniDownload API Server on port {port}")
+        logger.info("API docs available at /apidocs")
+        app.run(debug=True, host='0.0.0.0', port=port, use_reloader=False)
+    else:
+        logger.info("Set FLASK_ENV=development to use the dev server, or run: gunicorn -k gevent wsgi:app")
@@ -1,2 +1,2 @@
 #!/bin/bash
-gunicorn server:app --bind 0.0.0.0:${PORT:-5000} --workers 2 --timeout 120
+gunicorn -w 2 -k gevent --worker-connections 500 -b 0.0.0.0:${PORT:-5000} --access-logfile - --timeout 120 wsgi:app
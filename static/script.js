@@ -67,7 +67,8 @@ async function handleDetect() {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ url })
+            // Preview only; YouTube qualities are loaded on demand
+            body: JSON.stringify({ url, fields: 'title,uploader,thumbnail' })
         });
 
         const data = await response.json();
@@ -129,17 +130,23 @@ function displayMediaInfo(data) {
 
 function addYouTubeOptions(data, container) {
     // Video quality options
-    if (data.formats && data.formats.length > 0) {
+    if (!data.formats) {
         const videoGroup = document.createElement('div');
         videoGroup.className = 'option-group';
         videoGroup.innerHTML = '<h4>Video Quality</h4>';
-        
-        data.formats.forEach(format => {
-            const btn = createDownloadButton(`📹 ${format.label}`, () => {
-                startDownload('youtube', 'video', format.format_id);
-            });
-            videoGroup.appendChild(btn);
+
+        const loadBtn = createDownloadButton('📹 Show Video Qualities', () => {
+            loadYouTubeFormats(videoGroup, loadBtn);
         });
+        videoGroup.appendChild(loadBtn);
+
+        container.appendChild(videoGroup);
+    } else if (data.formats.length > 0) {
+        const videoGroup = document.createElement('div');
+        videoGroup.className = 'option-group';
+        videoGroup.innerHTML = '<h4>Video Quality</h4>';
+        
+        addFormatButtons(data.formats, videoGroup);
         
         container.appendChild(videoGroup);
     }
@@ -172,6 +179,50 @@ function addYouTubeOptions(data, container) {
     container.appendChild(otherGroup);
 }
 
+function addFormatButtons(formats, group) {
+    formats.forEach(format => {
+        const btn = createDownloadButton(`📹 ${format.label}`, () => {
+            startDownload('youtube', 'video', format.format_id);
+        });
+        group.appendChild(btn);
+    });
+}
+
+async function loadYouTubeFormats(group, loadBtn) {
+    loadBtn.disabled = true;
+    loadBtn.textContent = '⏳ Loading qualities...';
+
+    try {
+        const response = await fetch(`${API_BASE}/detect`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ url: currentUrl, fields: 'formats' })
+        });
+
+        const data = await response.json();
+
+        if (!response.ok) {
+            throw new Error(data.error || 'Failed to load video qualities');
+        }
+
+        currentMediaData.formats = data.formats || [];
+        loadBtn.remove();
+
+        if (currentMediaData.formats.length > 0) {
+            addFormatButtons(currentMediaData.formats, group);
+        } else {
+            group.remove();
+        }
+
+    } catch (error) {
+        showStatus(error.message, 'error');
+        loadBtn.disabled = false;
+        loadBtn.textContent = '📹 Show Video Qualities';
+    }
+}
+
 function addInstagramOptions(data, container) {
     const group = document.createElement('div');
     group.className = 'option-group';
@@ -0,0 +1,6 @@
+"""
+WSGI entrypoint for UniDownload
+Run with: gunicorn -w 2 -k gevent --worker-connections 500 -b 0.0.0.0:$PORT --access-logfile - wsgi:app
+"""
+
+from server import app
@@ -185,6 +185,9 @@ class YouTubeDownloader:
             download_subs: Download subtitles/captions
             download_thumb: Download thumbnail
             format_id: Specific format ID to download
+            
+        Returns:
+            bool: True if the download succeeded
         """
         output_template = os.path.join(self.download_path, '%(title)s.%(ext)s')
         
@@ -231,6 +234,7 @@ class YouTubeDownloader:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
             print("\n✓ Video downloaded successfully!")
+            return True
         except Exception as e:
             error_msg = str(e)
             print(f"\n✗ Error downloading video: {error_msg}")
@@ -243,6 +247,7 @@ class YouTubeDownloader:
                 print("  Option 2: Download from https://www.gyan.dev/ffmpeg/builds/")
                 print("            Extract and add to PATH")
                 print("\nAfter installing, restart your terminal and try again.")
+            return False
     
     def download_playlist(self, url, quality_height=None, output_format="mp4", download_subs=False):
         """
@@ -327,6 +332,9 @@ class YouTubeDownloader:
         
         Args:
             url: YouTube video URL
+            
+        Returns:
+            bool: True if the download succeeded
         """
         output_template = os.path.join(self.download_path, '%(title)s.%(ext)s')
         
@@ -343,8 +351,10 @@ class YouTubeDownloader:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
             print("\n✓ Thumbnail downloaded successfully!")
+            return True
         except Exception as e:
             print(f"\n✗ Error downloading thumbnail: {str(e)}")
+            return False
     
     def download_subtitles_only(self, url):
         """
@@ -352,6 +362,9 @@ class YouTubeDownloader:
         
         Args:
             url: YouTube video URL
+            
+        Returns:
+            bool: True if the download succeeded
         """
         output_template = os.path.join(self.download_path, '%(title)s.%(ext)s')
         
@@ -371,8 +384,10 @@ class YouTubeDownloader:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
             print("\n✓ Subtitles downloaded successfully!")
+            return True
         except Exception as e:
             print(f"\n✗ Error downloading subtitles: {str(e)}")
+            return False
     
     def download_audio(self, url):
         """
@@ -380,6 +395,9 @@ class YouTubeDownloader:
         
         Args:
             url: YouTube video URL
+            
+        Returns:
+            bool: True if the download succeeded
         """
         output_template = os.path.join(self.download_path, '%(title)s.%(ext)s')
         
@@ -405,8 +423,10 @@ class YouTubeDownloader:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([url])
             print("\n✓ Audio downloaded successfully!")
+            return True
         except Exception as e:
             print(f"\n✗ Error downloading audio: {str(e)}")
+            return False
     
     def _download_progress_hook(self, d):
         """Progress hook for download updates"""